@@ -1,4 +1,6 @@
 import uuid
+import asyncio
+import hashlib
 from typing import Optional, List, Dict
 from fastapi import (
     APIRouter, HTTPException, Depends, UploadFile, File, Form, Response, Cookie, Request
@@ -7,6 +9,8 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, HttpUrl
 
 from app.config import BEARER_TOKEN
+from app.utils.logger import logger
+from app.services.precompute import precompute_on_upload_enabled
 from session_manager import (
     get_session_data,
     update_session_data,
@@ -63,16 +67,18 @@ async def analyze_document_risks(
     """
     Analyzes the document in the current session for potential risks.
     """
-    llm_processor = request.app.state.llm_processor
+    precomputer = await request.app.state.services.get("precomputer")
 
     if not session_id or not (session_data := get_session_data(session_id)):
         raise HTTPException(status_code=400, detail="No active session. Please upload a document first.")
     
+    document_id = session_data["document_id"]
     full_text = session_data["full_text"]
     
-    found_risks = llm_processor.analyze_text_for_risks(full_text)
+    # Reuses a precomputed or in-flight analysis; None means it failed
+    found_risks = await precomputer.get_or_compute(document_id, "risks", full_text)
     
-    return AnalyzeResponse(risks=found_risks)
+    return AnalyzeResponse(risks=found_risks or [])
 
     
 @router.post("/upload", response_model=UploadResponse)
@@ -88,9 +94,9 @@ async def upload_document(
     Handles document upload and starts/resets a user session.
     """
     # Access the initialized services from the request's application state
-    content_processor = request.app.state.content_processor
-    text_chunker = request.app.state.text_chunker
-    vector_store = request.app.state.vector_store
+    content_processor = await request.app.state.services.get("content_processor")
+    text_chunker = await request.app.state.services.get("text_chunker")
+    vector_store = await request.app.state.services.get("vector_store")
     
     if not (url or file) or (url and file):
         raise HTTPException(status_code=400, detail="Provide either a URL or a file, but not both.")
@@ -113,7 +119,15 @@ async def upload_document(
     active_session_id = get_or_create_session_id(session_id)
     
     # Update the session storage with the new document's data
-    update_session_data(active_session_id, new_document_id, full_text)
+    # Identifies the document's content across uploads (shared answer cache)
+    content_hash = hashlib.sha256(full_text.encode("utf-8")).hexdigest()
+    update_session_data(active_session_id, new_document_id, full_text, content_hash)
+
+    # Speculatively prepare summary and risk analysis in the background. Checked
+    # first so uploads don't build the Gemini client when the feature is off
+    if precompute_on_upload_enabled():
+        precomputer = await request.app.state.services.get("precomputer")
+        precomputer.schedule(new_document_id, full_text)
     
     # Set the session ID in the user's browser cookie
     response.set_cookie(key="session_id", value=active_session_id, httponly=True)
@@ -131,20 +145,60 @@ async def process_documents(
     Answers questions based on the document in the current session.
     """
     # Access the initialized services from the request's application state
-    vector_store = request.app.state.vector_store
-    llm_processor = request.app.state.llm_processor
+    vector_store = await request.app.state.services.get("vector_store")
+    llm_processor = await request.app.state.services.get("llm_processor")
+    answer_cache = await request.app.state.services.get("answer_cache")
+    reranker = await request.app.state.services.get("reranker")
 
     if not session_id or not (session_data := get_session_data(session_id)):
         raise HTTPException(status_code=400, detail="No active session. Please upload a document first.")
     
     document_id = session_data["document_id"]
-    all_relevant_chunks = set()
-    for question in qa_request.questions:
-        relevant_chunks = vector_store.search(question, document_id)
-        all_relevant_chunks.update(relevant_chunks[:5])
+    questions = qa_request.questions
+    if not questions:
+        return ProcessResponse(answers=[])
+
+    # Serve repeated / near-duplicate questions from the answer cache
+    try:
+        question_embeddings = await vector_store.encode_queries(questions)
+    except Exception as e:
+        # Without embeddings, skip the cache and let search embed (and fail) per question
+        logger.error(f" Question embedding failed, bypassing answer cache: {e}")
+        question_embeddings = None
+
+    if question_embeddings is not None:
+        answers = answer_cache.lookup(session_data["content_hash"], question_embeddings)
+    else:
+        answers = [None] * len(questions)
+    new_indices = [i for i, answer in enumerate(answers) if answer is None]
+    if not new_indices:
+        return ProcessResponse(answers=answers)
+
+    new_questions = [questions[i] for i in new_indices]
+    if question_embeddings is not None:
+        new_embeddings = [question_embeddings[i] for i in new_indices]
+    else:
+        new_embeddings = [None] * len(new_indices)
+
+    # Searches run concurrently and reuse the embeddings computed above; they
+    # only embed per question if that up-front encode failed
+    search_results = await asyncio.gather(
+        *(vector_store.search_candidates(question, document_id, query_embedding=embedding)
+          for question, embedding in zip(new_questions, new_embeddings))
+    )
     
-    final_chunks = list(all_relevant_chunks)[:20]
-    answers = llm_processor.generate_answers(qa_request.questions, final_chunks)
+    # Diverse, relevant subset across all questions instead of top-5 per question;
+    # without embeddings the reranker interleaves results by question instead
+    final_chunks = reranker.select(
+        new_embeddings if question_embeddings is not None else None,
+        list(search_results)
+    )
+    new_answers, generated = await llm_processor.generate_answers_with_status(new_questions, final_chunks)
+    if question_embeddings is not None:
+        answer_cache.store(session_data["content_hash"], new_embeddings, new_answers, generated)
+
+    for i, answer in zip(new_indices, new_answers):
+        answers[i] = answer
         
     return ProcessResponse(answers=answers)
 
@@ -158,14 +212,15 @@ async def summarize_document(
     Summarizes the document in the current session.
     """
     # Access the initialized services from the request's application state
-    llm_processor = request.app.state.llm_processor
-    text_chunker = request.app.state.text_chunker
+    precomputer = await request.app.state.services.get("precomputer")
 
     if not session_id or not (session_data := get_session_data(session_id)):
         raise HTTPException(status_code=400, detail="No active session. Please upload a document first.")
     
+    document_id = session_data["document_id"]
     full_text = session_data["full_text"]
-    summary = llm_processor.summarize_text(full_text, text_chunker)
+    # Reuses a precomputed or in-flight summary instead of a duplicate call
+    summary = await precomputer.get_or_compute(document_id, "summary", full_text)
     return SummarizeResponse(summary=summary)
 
 # --- Utility Endpoints ---
@@ -173,3 +228,11 @@ async def summarize_document(
 async def health_check():
     return {"status": "healthy"}
 
+@router.get("/ready")
+async def readiness_check(request: Request, response: Response):
+    """Reports whether every dependency has been initialized and primed."""
+    status = request.app.state.services.readiness()
+    if not status["ready"]:
+        response.status_code = 503
+    return status
+
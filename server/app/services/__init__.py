@@ -1,11 +1,23 @@
-from .content_processor import ContentProcessor
-from .chunker import ImprovedTextChunker
-from .vector_store import EnhancedHybridVectorStore
-from .llm_processor import ImprovedLLMProcessor
-
-__all__ = [
-    "ContentProcessor",
-    "ImprovedTextChunker",
-    "EnhancedHybridVectorStore",
-    "ImprovedLLMProcessor",
-]
+import importlib
+
+# Services are imported on first attribute access so importing the package
+# does not pull in LangChain, Pinecone, OpenAI or Gemini.
+_EXPORTS = {
+    "ContentProcessor": ".content_processor",
+    "ImprovedTextChunker": ".chunker",
+    "EnhancedHybridVectorStore": ".vector_store",
+    "ImprovedLLMProcessor": ".llm_processor",
+    "GeminiClient": ".gemini_client",
+    "SemanticAnswerCache": ".answer_cache",
+    "MMRReranker": ".reranker",
+    "DocumentPrecomputer": ".precompute",
+    "ServiceRegistry": ".registry",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
@@ -0,0 +1,82 @@
+import os
+from collections import OrderedDict
+from typing import List, Optional
+import numpy as np
+from app.utils.logger import logger
+
+
+class SemanticAnswerCache:
+    """
+    Cache of answered questions per document content. Entries are keyed by a
+    hash of the document text, so every upload of the same document shares
+    them. A new question reuses a cached answer when its embedding's cosine
+    similarity to a stored question meets the threshold.
+    """
+
+    def __init__(self, threshold: float = None, max_entries_per_document: int = 256, max_documents: int = 512):
+        self.threshold = threshold or float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.95"))
+        self.max_entries_per_document = max_entries_per_document
+        self.max_documents = max_documents
+        # content_hash -> {"embeddings": (n, d) unit-normalized matrix, "answers": [str]}
+        self._documents = OrderedDict()
+
+    @staticmethod
+    def _normalize(embeddings) -> np.ndarray:
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+
+    def lookup(self, content_hash: str, question_embeddings) -> List[Optional[str]]:
+        """Returns the cached answer for each question, or None where there is no close match."""
+        entry = self._documents.get(content_hash)
+        if entry is None or len(question_embeddings) == 0:
+            return [None] * len(question_embeddings)
+        self._documents.move_to_end(content_hash)
+
+        # (questions, cached) cosine similarity matrix in one matmul
+        similarities = self._normalize(question_embeddings) @ entry["embeddings"].T
+        best = similarities.argmax(axis=1)
+        best_scores = similarities[np.arange(len(best)), best]
+
+        results = [
+            entry["answers"][idx] if score >= self.threshold else None
+            for idx, score in zip(best.tolist(), best_scores.tolist())
+        ]
+        hits = sum(answer is not None for answer in results)
+        if hits:
+            logger.info(" Answer cache served %d/%d questions for document %s", hits, len(results), content_hash[:12])
+        return results
+
+    def store(self, content_hash: str, question_embeddings, answers: List[str], generated: Optional[List[bool]] = None):
+        """
+        Adds answered questions to the document's cache. Only answers flagged in
+        `generated` (real model output, not placeholders) are kept; errors never are.
+        """
+        if generated is None:
+            generated = [True] * len(answers)
+        keep = [
+            i for i, (answer, is_generated) in enumerate(zip(answers, generated))
+            if is_generated and isinstance(answer, str) and not answer.startswith("Error")
+        ]
+        if not keep:
+            return
+
+        new_embeddings = self._normalize([question_embeddings[i] for i in keep])
+        new_answers = [answers[i] for i in keep]
+
+        entry = self._documents.get(content_hash)
+        if entry is None:
+            entry = {"embeddings": new_embeddings, "answers": new_answers}
+        else:
+            entry = {
+                "embeddings": np.vstack([entry["embeddings"], new_embeddings]),
+                "answers": entry["answers"] + new_answers,
+            }
+        # Keep only the most recent entries
+        entry["embeddings"] = entry["embeddings"][-self.max_entries_per_document:]
+        entry["answers"] = entry["answers"][-self.max_entries_per_document:]
+
+        self._documents[content_hash] = entry
+        self._documents.move_to_end(content_hash)
+        while len(self._documents) > self.max_documents:
+            self._documents.popitem(last=False)
@@ -1,5 +1,6 @@
 # app/services/embedding_model.py
 import os
+import asyncio
 from openai import OpenAI
 
 class OpenAIEmbeddingModel:
@@ -24,3 +25,70 @@ class OpenAIEmbeddingModel:
         # Extract embeddings from response
         embeddings = [item.embedding for item in response.data]
         return embeddings
+
+
+class EmbeddingMicroBatcher:
+    """
+    Coalesces concurrent encode() calls into a single embeddings API request.
+    Requests arriving within `window_ms`, or until `max_batch_size` texts are
+    queued, are sent together and the results dispatched back to each caller.
+    """
+    def __init__(self, embedding_model, window_ms=None, max_batch_size=None):
+        self.embedding_model = embedding_model
+        if window_ms is None:
+            window_ms = float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "5"))
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size or int(os.getenv("EMBEDDING_MAX_BATCH", "64"))
+        self._pending = []  # (texts, future) pairs waiting for the next flush
+        self._pending_count = 0
+        self._flush_handle = None
+        # Strong references so in-flight batch tasks are not garbage-collected
+        self._batch_tasks = set()
+
+    async def encode(self, texts):
+        """
+        Async counterpart of OpenAIEmbeddingModel.encode() that shares API calls
+        with other callers in the same batching window.
+        """
+        if isinstance(texts, str):
+            texts = [texts]
+        if not texts:
+            return []
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((list(texts), future))
+        self._pending_count += len(texts)
+
+        if self._pending_count >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending, self._pending_count = self._pending, [], 0
+        if batch:
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, batch):
+        all_texts = [text for texts, _ in batch for text in texts]
+        try:
+            embeddings = await asyncio.to_thread(self.embedding_model.encode, all_texts)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for texts, future in batch:
+            if not future.done():
+                future.set_result(embeddings[offset:offset + len(texts)])
+            offset += len(texts)
@@ -0,0 +1,130 @@
+import os
+import time
+import random
+import asyncio
+from typing import Optional
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+from app.utils.logger import logger
+
+# Errors worth retrying: quota exhaustion plus transient server-side failures.
+RETRYABLE_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.DeadlineExceeded,
+)
+RATE_LIMIT_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.TooManyRequests,
+)
+
+
+class GeminiClient:
+    """
+    Shared Gemini client: one GenerativeModel per model name, async generation,
+    a global concurrency/rate limit and adaptive backoff on 429s.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "gemini-2.0-flash",
+        max_concurrency: Optional[int] = None,
+        requests_per_minute: Optional[int] = None,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        timeout: Optional[float] = None,
+    ):
+        self.model_name = model_name
+        self.max_concurrency = max_concurrency or int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+        self.requests_per_minute = requests_per_minute or int(os.getenv("GEMINI_RPM", "60"))
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        # Per-call deadline so a hung request cannot hold a concurrency slot forever
+        self.timeout = timeout or float(os.getenv("GEMINI_TIMEOUT_SECONDS", "60"))
+
+        self._models = {}
+        self._semaphore = None
+        self._rate_lock = None
+        self._next_slot = 0.0
+        # Shared cooldown: a 429 pauses every caller, not just the one that hit it.
+        self._cooldown_until = 0.0
+        self._rate_limit_streak = 0
+        # Calls currently waiting on or talking to Gemini; background work yields while > 0
+        self.active_requests = 0
+
+    def get_model(self, model_name: Optional[str] = None):
+        """Returns the cached GenerativeModel, creating it on first use."""
+        name = model_name or self.model_name
+        model = self._models.get(name)
+        if model is None:
+            model = genai.GenerativeModel(name)
+            self._models[name] = model
+        return model
+
+    def check_access(self):
+        """Cheap authenticated call that fails if the API key or model is unusable."""
+        return genai.get_model(f"models/{self.model_name}")
+
+    def _ensure_primitives(self):
+        # asyncio primitives are created lazily so they bind to the running loop.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._rate_lock = asyncio.Lock()
+
+    async def _acquire_rate_slot(self):
+        """Spaces request starts evenly to stay under the per-minute quota."""
+        interval = 60.0 / self.requests_per_minute
+        async with self._rate_lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_slot, self._cooldown_until)
+            self._next_slot = start_at + interval
+        delay = start_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        cap = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, cap)
+
+    async def generate(self, prompt: str, model_name: Optional[str] = None):
+        """Generates content asynchronously, retrying rate-limit and transient errors."""
+        self._ensure_primitives()
+        model = self.get_model(model_name)
+
+        self.active_requests += 1
+        try:
+            return await self._generate_with_retries(model, prompt)
+        finally:
+            self.active_requests -= 1
+
+    async def _generate_with_retries(self, model, prompt: str):
+        for attempt in range(self.max_retries + 1):
+            await self._acquire_rate_slot()
+            try:
+                async with self._semaphore:
+                    response = await model.generate_content_async(
+                        prompt, request_options={"timeout": self.timeout}
+                    )
+                self._rate_limit_streak = 0
+                return response
+            except RETRYABLE_ERRORS as e:
+                if attempt >= self.max_retries:
+                    logger.error(f"Gemini call failed after {attempt + 1} attempts: {e}")
+                    raise
+
+                delay = self._backoff_delay(attempt)
+                if isinstance(e, RATE_LIMIT_ERRORS):
+                    # Consecutive 429s widen the shared cooldown window.
+                    self._rate_limit_streak += 1
+                    delay = max(delay, self._backoff_delay(self._rate_limit_streak))
+                    self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+
+                logger.warning(
+                    f"Gemini call failed ({type(e).__name__}), retry {attempt + 1}/{self.max_retries} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
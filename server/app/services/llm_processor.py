@@ -1,17 +1,17 @@
-from typing import List, Dict
+from typing import List, Dict, Tuple, Optional
 import re
 import json
 import traceback
-import google.generativeai as genai
-from app.utils.logger import logger
+from app.services.gemini_client import GeminiClient
+from app.utils.logger import logger, Truncated, content_log_enabled
 import time 
 class ImprovedLLMProcessor:
     """Enhanced LLM processor with better prompting and context handling"""
 
-    def analyze_text_for_risks(self, text: str) -> list:
+    async def analyze_text_for_risks(self, text: str) -> Optional[list]:
         """
         Analyzes text for a predefined checklist of financial and legal risks
-        using a single API call.
+        using a single API call. Returns None if the analysis failed.
         """
         logger.info("Starting single-call risk analysis...")
 
@@ -52,8 +52,7 @@ You are an expert legal document analyst. Your task is to analyze the provided d
 """
 
         try:
-            model = genai.GenerativeModel(self.model_name)
-            response = model.generate_content(single_call_prompt)
+            response = await self.gemini_client.generate(single_call_prompt)
 
             json_str_match = re.search(r'```json\s*(\{.*?\})\s*```', response.text, re.DOTALL)
             if json_str_match:
@@ -74,19 +73,19 @@ You are an expert legal document analyst. Your task is to analyze the provided d
                 return found_risks
             else:
                 logger.warning("LLM response had invalid structure. Expected a dict with a 'risks' list.")
-                return [] 
+                return None
 
         except (json.JSONDecodeError, ValueError) as e:
             logger.error(f"Failed to parse JSON from LLM response for risk analysis: {e}")
             logger.debug(f"Raw response was: {response.text}")
-            return [] 
+            return None
         except Exception as e:
             logger.error(f"An unexpected error occurred during risk analysis: {e}")
-            return []
+            return None
    
     
 
-    def summarize_text(self, text: str, chunker=None) -> str:
+    async def summarize_text(self, text: str, chunker=None) -> str:
         """
         Summarizes a large text using a single API call, designed for models
         with large context windows.
@@ -111,8 +110,7 @@ You are an expert legal analyst. Your task is to provide a clear and effective s
 ---
 """
         try:
-            model = genai.GenerativeModel(self.model_name)
-            response = model.generate_content(prompt)
+            response = await self.gemini_client.generate(prompt)
             final_summary = response.text.strip()
             
             logger.info("Successfully generated summary in a single call.")
@@ -124,8 +122,9 @@ You are an expert legal analyst. Your task is to provide a clear and effective s
             return f"Error during summarization: {str(e)}"
 
     
-    def __init__(self, model_name: str = "gemini-2.0-flash"):
+    def __init__(self, model_name: str = "gemini-2.0-flash", gemini_client: GeminiClient = None):
         self.model_name = model_name
+        self.gemini_client = gemini_client or GeminiClient(model_name=model_name)
         self.system_prompt ="""You are an AI assistant designed to help users understand complex documents. Your role is to be a helpful and cautious guide.
 
 **Core Directives:**
@@ -144,16 +143,25 @@ You are an expert legal analyst. Your task is to provide a clear and effective s
 "The notice period for termination is 30 days. The document states in Section 8.2 that either party must provide written notice at least thirty days prior to ending the agreement.\\n(Disclaimer: This is an AI-generated interpretation and not legal advice. Please consult a professional for important decisions.)"
 """
     
-    def generate_answers(self, questions: List[str], context_chunks: List[str]) -> List[str]:
+    async def generate_answers(self, questions: List[str], context_chunks: List[str]) -> List[str]:
         """Generate answers with improved context handling and logging"""
+        answers, _ = await self.generate_answers_with_status(questions, context_chunks)
+        return answers
+
+    async def generate_answers_with_status(self, questions: List[str], context_chunks: List[str]) -> Tuple[List[str], List[bool]]:
+        """
+        Like generate_answers(), but also returns a flag per answer that is True
+        only when it was parsed from the model's JSON (not a placeholder or error).
+        """
+        # One sampling decision so prompt, response and answers are logged together
+        log_content = content_log_enabled()
         try:
             context = self.format_context(context_chunks)
             
-            logger.info(f" Sending to LLM:")
-            logger.info(f"  - Questions: {len(questions)}")
-            logger.info(f"  - Context chunks: {len(context_chunks)}")
-            logger.info(f"  - Total context length: {len(context)} chars")
-            logger.info(f"  - Model: {self.model_name}")
+            logger.info(
+                " Sending to LLM: %d questions, %d context chunks, %d context chars, model %s",
+                len(questions), len(context_chunks), len(context), self.model_name
+            )
             
             questions_text = "\n".join([f"{i+1}. {q}" for i, q in enumerate(questions)])
             user_message = f"""CONTEXT CHUNKS:
@@ -164,27 +172,29 @@ QUESTIONS TO ANSWER:
 
 Please answer each question based only on the provided context chunks. Look for both direct information and related concepts that can help answer the questions."""
             
-            logger.info("Prompt preview (first 500 chars): " + (user_message[:500] + "..." if len(user_message) > 500 else user_message))
+            if log_content:
+                logger.info("Prompt preview: %s", Truncated(user_message, 500))
             
             logger.info("Making Gemini API call...")
-            model = genai.GenerativeModel(self.model_name)
-            response = model.generate_content(f"{self.system_prompt}\n\n{user_message}")
+            response = await self.gemini_client.generate(f"{self.system_prompt}\n\n{user_message}")
             response_text = response.text.strip()
             
-            logger.info(f" Raw LLM Response (first 500 chars): {response_text[:500]}...")
+            if log_content:
+                logger.info(" Raw LLM Response: %s", Truncated(response_text, 500))
             
-            parsed_answers = self.parse_response(response_text, questions)
+            parsed_answers, generated = self.parse_response_with_status(response_text, questions)
             
-            logger.info(f" Generated answers for {len(questions)} questions:")
-            for i, answer in enumerate(parsed_answers, 1):
-                logger.info(f"  {i}. {answer}")
+            logger.info(" Generated answers for %d questions", len(questions))
+            if log_content:
+                for i, answer in enumerate(parsed_answers, 1):
+                    logger.info("  %d. %s", i, Truncated(answer))
             
-            return parsed_answers
+            return parsed_answers, generated
             
         except Exception as e:
             logger.error(f" Failed to generate answers: {e}")
             logger.error(traceback.format_exc())
-            return [f"Error: {str(e)}" for _ in questions]
+            return [f"Error: {str(e)}" for _ in questions], [False] * len(questions)
     
     def format_context(self, chunks: List[str]) -> str:
         """Format context chunks for better LLM understanding"""
@@ -192,6 +202,11 @@ Please answer each question based only on the provided context chunks. Look for
     
     def parse_response(self, response_text: str, questions: List[str]) -> List[str]:
         """Parse LLM response with improved error handling"""
+        answers, _ = self.parse_response_with_status(response_text, questions)
+        return answers
+
+    def parse_response_with_status(self, response_text: str, questions: List[str]) -> Tuple[List[str], List[bool]]:
+        """Parse LLM response, flagging which answers came from the JSON rather than padding or fallback"""
         try:
             json_match = re.search(r'```json\s*(\{.*?\})\s*```', response_text, re.DOTALL)
             if json_match:
@@ -211,13 +226,16 @@ Please answer each question based only on the provided context chunks. Look for
             if not isinstance(answers, list):
                 raise ValueError("'answers' must be a list")
             
+            answers = answers[:len(questions)]
+            generated = [isinstance(answer, str) for answer in answers]
             while len(answers) < len(questions):
                 answers.append("Unable to find relevant information in the provided context.")
-            return answers[:len(questions)]
+                generated.append(False)
+            return answers, generated
         
         except Exception as err:
             logger.warning(f"JSON parsing failed: {err}")
-            return self.fallback_parse(response_text, questions)
+            return self.fallback_parse(response_text, questions), [False] * len(questions)
     
     def fallback_parse(self, response_text: str, questions: List[str]) -> List[str]:
         """Fallback parsing when JSON fails"""
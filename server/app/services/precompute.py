@@ -0,0 +1,153 @@
+import os
+import time
+import asyncio
+from collections import OrderedDict
+from typing import Optional
+from app.utils.logger import logger, request_id_var, content_sampled_var
+
+
+def precompute_on_upload_enabled() -> bool:
+    return os.getenv("PRECOMPUTE_ON_UPLOAD", "false").lower() == "true"
+
+
+class DocumentPrecomputer:
+    """
+    Speculatively computes the summary and risk analysis for a newly uploaded
+    document on a low-priority background queue. Jobs wait for interactive
+    Gemini traffic to drain and are limited to a per-minute budget.
+
+    Endpoints go through `get_or_compute()`, which returns a stored result,
+    awaits a computation already in flight for the same document and task, or
+    computes on demand. Only successful results are stored or shared.
+    """
+
+    TASKS = ("summary", "risks")
+
+    def __init__(self, llm_processor, text_chunker, gemini_client, max_per_minute: int = None, max_documents: int = 256):
+        self.llm_processor = llm_processor
+        self.text_chunker = text_chunker
+        self.gemini_client = gemini_client
+        self.enabled = precompute_on_upload_enabled()
+        self.max_per_minute = max_per_minute or int(os.getenv("PRECOMPUTE_MAX_PER_MINUTE", "10"))
+        self.max_documents = max_documents
+        self.idle_poll_interval = 0.5
+
+        # document_id -> {"summary": str, "risks": list}
+        self._results = OrderedDict()
+        # (document_id, task) -> future resolved with a successful result, or None
+        self._in_flight = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._recent_calls = []
+
+    def get(self, document_id: str, task: str):
+        """Returns a stored result, or None if it has not been computed yet."""
+        return self._results.get(document_id, {}).get(task)
+
+    def store(self, document_id: str, task: str, result):
+        self._results.setdefault(document_id, {})[task] = result
+        self._results.move_to_end(document_id)
+        while len(self._results) > self.max_documents:
+            self._results.popitem(last=False)
+
+    async def get_or_compute(self, document_id: str, task: str, text: str):
+        """
+        Returns the result for a document's task, reusing a stored or in-flight
+        computation when possible. A failed on-demand attempt returns the
+        processor's own failure value (an "Error..." summary, or None for risks).
+        """
+        result = self.get(document_id, task)
+        if result is not None:
+            return result
+
+        pending = self._in_flight.get((document_id, task))
+        if pending is not None:
+            # shield: a cancelled request must not cancel the shared computation
+            result = await asyncio.shield(pending)
+            if result is not None:
+                return result
+
+        return await self._compute(document_id, task, text)
+
+    async def _compute(self, document_id: str, task: str, text: str):
+        key = (document_id, task)
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        succeeded = None
+        try:
+            if task == "summary":
+                result = await self.llm_processor.summarize_text(text, self.text_chunker)
+                succeeded = result if not result.startswith("Error") else None
+            else:
+                result = await self.llm_processor.analyze_text_for_risks(text)
+                succeeded = result
+            if succeeded is not None:
+                self.store(document_id, task, succeeded)
+            return result
+        finally:
+            # Waiters treat None as failure and fall back to their own attempt
+            if not future.done():
+                future.set_result(succeeded)
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def schedule(self, document_id: str, text: str):
+        """Queues background summary and risk analysis for a document, if enabled."""
+        if not self.enabled:
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        for task in self.TASKS:
+            self._queue.put_nowait((document_id, task, text))
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    def _already_handled(self, document_id: str, task: str) -> bool:
+        return self.get(document_id, task) is not None or (document_id, task) in self._in_flight
+
+    async def _wait_for_budget(self):
+        # Yield to interactive requests, then respect the per-minute budget
+        while self.gemini_client.active_requests > 0:
+            await asyncio.sleep(self.idle_poll_interval)
+
+        now = time.monotonic()
+        self._recent_calls = [t for t in self._recent_calls if now - t < 60]
+        if len(self._recent_calls) >= self.max_per_minute:
+            await asyncio.sleep(60 - (now - self._recent_calls[0]))
+            await self._wait_for_budget()
+            return
+        self._recent_calls.append(time.monotonic())
+
+    async def _run(self):
+        while True:
+            document_id, task, text = await self._queue.get()
+            # The worker task copied the context of the upload that started it;
+            # give each job its own correlation id instead of that request's
+            request_id_var.set(f"precompute:{document_id}")
+            content_sampled_var.set(None)
+            try:
+                if self._already_handled(document_id, task):
+                    continue
+                await self._wait_for_budget()
+                # An on-demand request may have started or finished it while we waited
+                if self._already_handled(document_id, task):
+                    continue
+
+                await self._compute(document_id, task, text)
+                if self.get(document_id, task) is not None:
+                    logger.info("Precomputed %s for document %s", task, document_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Precompute of %s for document %s failed: %s", task, document_id, e)
+            finally:
+                self._queue.task_done()
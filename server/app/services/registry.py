@@ -0,0 +1,266 @@
+import os
+import time
+import asyncio
+import threading
+import importlib
+from typing import Dict
+from app.utils.logger import logger, request_id_var
+
+
+class ServiceRegistry:
+    """
+    Lazily constructs the app's services on first access so startup does not
+    pay for LangChain, Pinecone, OpenAI and Gemini imports and client setup.
+    `warm_up()` builds and primes everything ahead of traffic, and `readiness()`
+    reports which dependencies are actually usable.
+
+    Request handlers must use the async `get()`: first-time builds then run in
+    a worker thread and never block the event loop on the registry lock.
+    """
+
+    SERVICES = (
+        "embedding_model",
+        "embedding_batcher",
+        "pinecone_index",
+        "gemini_client",
+        "content_processor",
+        "text_chunker",
+        "llm_processor",
+        "answer_cache",
+        "reranker",
+        "vector_store",
+        "precomputer",
+    )
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._instances = {}
+        self._errors: Dict[str, str] = {}
+        self.import_times: Dict[str, float] = {}
+        self.warmed_up = False
+        self.reprobe_interval = 5.0
+        self._last_reprobe = 0.0
+        self._warmup_task = None
+        self._reprobe_task = None
+
+    def _import(self, module_name: str):
+        """Imports a module, recording how long the first import took."""
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        self.import_times.setdefault(module_name, time.perf_counter() - start)
+        return module
+
+    def _get(self, name: str):
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            if name not in self._instances:
+                logger.info("Initializing %s...", name)
+                try:
+                    self._instances[name] = getattr(self, f"_build_{name}")()
+                    self._errors.pop(name, None)
+                except Exception as e:
+                    self._errors[name] = str(e)
+                    raise
+            return self._instances[name]
+
+    async def get(self, name: str):
+        """Returns a service, building it in a worker thread on first use."""
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        return await asyncio.to_thread(self._get, name)
+
+    # --- Factories ---
+
+    def _build_embedding_model(self):
+        return self._import("app.services.embedding_model").OpenAIEmbeddingModel()
+
+    def _build_embedding_batcher(self):
+        module = self._import("app.services.embedding_model")
+        return module.EmbeddingMicroBatcher(self.embedding_model)
+
+    def _build_pinecone_index(self):
+        pinecone = self._import("pinecone")
+        pc = pinecone.Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
+        return pc.Index(os.getenv("PINECONE_INDEX"))
+
+    def _build_gemini_client(self):
+        genai = self._import("google.generativeai")
+        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+        return self._import("app.services.gemini_client").GeminiClient()
+
+    def _build_content_processor(self):
+        return self._import("app.services.content_processor").ContentProcessor()
+
+    def _build_text_chunker(self):
+        return self._import("app.services.chunker").ImprovedTextChunker()
+
+    def _build_llm_processor(self):
+        module = self._import("app.services.llm_processor")
+        return module.ImprovedLLMProcessor(gemini_client=self.gemini_client)
+
+    def _build_answer_cache(self):
+        return self._import("app.services.answer_cache").SemanticAnswerCache()
+
+    def _build_reranker(self):
+        return self._import("app.services.reranker").MMRReranker()
+
+    def _build_vector_store(self):
+        module = self._import("app.services.vector_store")
+        return module.EnhancedHybridVectorStore(
+            embedding_model=self.embedding_model,
+            pinecone_index=self.pinecone_index,
+            embedding_batcher=self.embedding_batcher
+        )
+
+    def _build_precomputer(self):
+        module = self._import("app.services.precompute")
+        return module.DocumentPrecomputer(
+            llm_processor=self.llm_processor,
+            text_chunker=self.text_chunker,
+            gemini_client=self.gemini_client
+        )
+
+    # --- Accessors ---
+
+    @property
+    def embedding_model(self):
+        return self._get("embedding_model")
+
+    @property
+    def embedding_batcher(self):
+        return self._get("embedding_batcher")
+
+    @property
+    def pinecone_index(self):
+        return self._get("pinecone_index")
+
+    @property
+    def gemini_client(self):
+        return self._get("gemini_client")
+
+    @property
+    def content_processor(self):
+        return self._get("content_processor")
+
+    @property
+    def text_chunker(self):
+        return self._get("text_chunker")
+
+    @property
+    def llm_processor(self):
+        return self._get("llm_processor")
+
+    @property
+    def answer_cache(self):
+        return self._get("answer_cache")
+
+    @property
+    def reranker(self):
+        return self._get("reranker")
+
+    @property
+    def vector_store(self):
+        return self._get("vector_store")
+
+    @property
+    def precomputer(self):
+        return self._get("precomputer")
+
+    def built_services(self):
+        """Names of the services constructed so far."""
+        return list(self._instances)
+
+    # --- Warm-up and readiness ---
+
+    def warm_up(self):
+        """
+        Builds every service, opens the Pinecone and OpenAI connections with a
+        cheap first call, and logs an import-time profile. Blocking; run it off
+        the event loop.
+        """
+        # Runs in a copied context; don't log under the request that triggered it
+        request_id_var.set("warm-up")
+        start = time.perf_counter()
+        for name in self.SERVICES:
+            self._initialize(name)
+
+        self.warmed_up = True
+        logger.info("Warm-up finished in %.2fs", time.perf_counter() - start)
+        self.log_import_profile()
+
+    # Cheap first calls that open connections and prove a dependency is reachable
+    PROBES = {
+        "pinecone_index": lambda index: index.describe_index_stats(),
+        "embedding_model": lambda model: model.encode(["warm-up"]),
+        "gemini_client": lambda client: client.check_access(),
+    }
+
+    def _initialize(self, name: str) -> bool:
+        """Builds a service and runs its probe, recording or clearing its error."""
+        try:
+            instance = self._get(name)
+            probe = self.PROBES.get(name)
+            if probe is not None:
+                probe(instance)
+        except Exception as e:
+            self._errors[name] = str(e)
+            logger.error("Initialization of %s failed: %s", name, e)
+            return False
+        self._errors.pop(name, None)
+        return True
+
+    def _retry_failed(self):
+        request_id_var.set("re-probe")
+        for name in self.SERVICES:
+            if name in self._errors:
+                self._initialize(name)
+
+    def start_warm_up(self):
+        """Runs warm_up() in a background thread unless it is already running or done."""
+        if self.warmed_up or (self._warmup_task is not None and not self._warmup_task.done()):
+            return
+        self._warmup_task = asyncio.create_task(asyncio.to_thread(self.warm_up))
+
+    def log_import_profile(self):
+        """Logs the recorded import times, slowest first."""
+        if not self.import_times:
+            return
+        report = ", ".join(
+            f"{name}={seconds:.3f}s"
+            for name, seconds in sorted(self.import_times.items(), key=lambda item: item[1], reverse=True)
+        )
+        logger.info("Import-time profile: %s", report)
+
+    def readiness(self) -> dict:
+        """
+        Per-service status plus an overall ready flag. Never blocks: it starts
+        warm-up if it has not run (e.g. WARMUP_ON_STARTUP=false) and re-probes
+        failed services in the background, at most every `reprobe_interval`.
+        """
+        self.start_warm_up()
+        now = time.monotonic()
+        if (
+            self.warmed_up and self._errors
+            and (self._reprobe_task is None or self._reprobe_task.done())
+            and now - self._last_reprobe >= self.reprobe_interval
+        ):
+            self._last_reprobe = now
+            self._reprobe_task = asyncio.create_task(asyncio.to_thread(self._retry_failed))
+
+        services = {}
+        for name in self.SERVICES:
+            if name in self._errors:
+                services[name] = f"error: {self._errors[name]}"
+            elif name in self._instances:
+                services[name] = "ready"
+            else:
+                services[name] = "not_initialized"
+        return {
+            "ready": all(status == "ready" for status in services.values()),
+            "warmed_up": self.warmed_up,
+            "services": services,
+            "import_times": {name: round(seconds, 3) for name, seconds in self.import_times.items()},
+        }
@@ -0,0 +1,105 @@
+import os
+from typing import List, Optional
+import numpy as np
+from app.utils.logger import logger
+
+
+class MMRReranker:
+    """
+    Maximal-marginal-relevance selection over the candidate chunks retrieved
+    for all questions, trading relevance against redundancy.
+    """
+
+    def __init__(self, top_k: int = None, lambda_mult: float = None, min_per_question: int = None):
+        self.top_k = top_k or int(os.getenv("MMR_TOP_K", "10"))
+        self.lambda_mult = lambda_mult if lambda_mult is not None else float(os.getenv("MMR_LAMBDA", "0.7"))
+        self.min_per_question = min_per_question or int(os.getenv("MMR_MIN_PER_QUESTION", "2"))
+
+    @staticmethod
+    def _normalize(vectors) -> np.ndarray:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+
+    def target_count(self, num_questions: int) -> int:
+        """Chunks to keep: at least `top_k`, growing with the number of questions."""
+        return max(self.top_k, self.min_per_question * num_questions)
+
+    @staticmethod
+    def _interleave(candidates_per_question: List[List[dict]], limit: int) -> List[str]:
+        """Round-robin over each question's results (already in score order), deduplicated."""
+        texts = {}
+        longest = max((len(result) for result in candidates_per_question), default=0)
+        for rank in range(longest):
+            for result in candidates_per_question:
+                if rank < len(result):
+                    texts.setdefault(result[rank]["text"], None)
+                    if len(texts) >= limit:
+                        return list(texts)
+        return list(texts)
+
+    def select(self, query_embeddings: Optional[list], candidates_per_question: List[List[dict]]) -> List[str]:
+        """
+        Picks chunk texts from each question's candidates (dicts with "text",
+        "values" and "score", in retrieval order). `query_embeddings` holds one
+        embedding per question; without them, or for chunks missing vectors,
+        results are interleaved across questions by rank instead.
+        """
+        k = self.target_count(len(candidates_per_question))
+        if query_embeddings is None:
+            return self._interleave(candidates_per_question, k)
+
+        # Overlapping question results return the same chunks; keep one copy
+        unique = {}
+        for result in candidates_per_question:
+            for candidate in result:
+                if candidate.get("values"):
+                    unique.setdefault(candidate["text"], candidate["values"])
+
+        selected_texts = self._mmr(query_embeddings, unique, k) if unique else []
+        if len(selected_texts) < k:
+            without_vectors = [
+                [candidate for candidate in result if not candidate.get("values")]
+                for result in candidates_per_question
+            ]
+            if any(without_vectors):
+                logger.warning(" Some candidate chunks had no vectors; ranked by retrieval order")
+                chosen = set(selected_texts)
+                for text in self._interleave(without_vectors, k):
+                    if len(selected_texts) >= k:
+                        break
+                    if text not in chosen and text not in unique:
+                        selected_texts.append(text)
+        return selected_texts
+
+    def _mmr(self, query_embeddings, unique: dict, k: int) -> List[str]:
+        texts = list(unique)
+        chunk_matrix = self._normalize(list(unique.values()))
+        query_matrix = self._normalize(query_embeddings)
+
+        # (chunks, questions) cosine scores. Their scale differs per question, so
+        # rescale each column to [0, 1] before taking a chunk's best relevance.
+        scores = chunk_matrix @ query_matrix.T
+        low = scores.min(axis=0)
+        span = scores.max(axis=0) - low
+        relevance = ((scores - low) / np.where(span > 0, span, 1.0)).max(axis=1)
+        similarity = chunk_matrix @ chunk_matrix.T
+
+        k = min(k, len(texts))
+        # Seed with every question's best chunk so no question is left without context
+        selected = list(dict.fromkeys(int(i) for i in scores.argmax(axis=0)))[:k]
+        available = np.ones(len(texts), dtype=bool)
+        available[selected] = False
+        # Highest similarity of each candidate to anything already selected
+        redundancy = similarity[selected].max(axis=0)
+
+        while len(selected) < k:
+            mmr_scores = self.lambda_mult * relevance - (1 - self.lambda_mult) * redundancy
+            mmr_scores[~available] = -np.inf
+            best = int(mmr_scores.argmax())
+            selected.append(best)
+            available[best] = False
+            np.maximum(redundancy, similarity[best], out=redundancy)
+
+        logger.info(" MMR selected %d of %d unique candidate chunks", len(selected), len(texts))
+        return [texts[i] for i in selected]
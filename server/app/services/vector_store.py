@@ -1,5 +1,6 @@
 
 
+import asyncio
 from typing import List
 from app.utils.logger import logger
 
@@ -7,31 +8,59 @@ from app.utils.logger import logger
 class EnhancedHybridVectorStore:
     """Enhanced hybrid vector storage that receives initialized models."""
     
-    def __init__(self, embedding_model, pinecone_index):
+    def __init__(self, embedding_model, pinecone_index, embedding_batcher=None):
         self.embedding_model = embedding_model
+        self.embedding_batcher = embedding_batcher
         self.pinecone_index = pinecone_index
         self.namespace = "insurance_docs"
 
-    def search(self, query: str, document_id: str, limit: int = 15) -> List[str]:
+    async def encode_queries(self, queries: List[str]) -> List[List[float]]:
+        """Embeds queries through the micro-batcher when one is configured."""
+        if self.embedding_batcher is not None:
+            return await self.embedding_batcher.encode(queries)
+        return await asyncio.to_thread(self.embedding_model.encode, queries)
+
+    async def _query(self, query: str, document_id: str, limit: int, query_embedding, include_values: bool = False):
+        if query_embedding is None:
+            query_embedding = (await self.encode_queries([query]))[0]
+        
+        return await asyncio.to_thread(
+            self.pinecone_index.query,
+            vector=query_embedding,
+            top_k=limit,
+            namespace=self.namespace,
+            filter={"document_id": {"$eq": document_id}},
+            include_metadata=True,
+            include_values=include_values
+        )
+
+    async def search(self, query: str, document_id: str, limit: int = 15, query_embedding=None) -> List[str]:
         """Primary Pinecone search with document filtering."""
         try:
-            query_embedding = self.embedding_model.encode([query])[0]
-            
-            results = self.pinecone_index.query(
-                vector=query_embedding,
-                top_k=limit,
-                namespace=self.namespace,
-                filter={"document_id": {"$eq": document_id}},
-                include_metadata=True
-            )
+            results = await self._query(query, document_id, limit, query_embedding)
             
             documents = [match.metadata.get("text", "") for match in results.matches if "text" in match.metadata]
-            logger.info(f" Search found {len(documents)} chunks for document {document_id}")
+            logger.info(" Search found %d chunks for document %s", len(documents), document_id)
             return documents
         except Exception as e:
             logger.error(f" Search failed: {e}")
             return []
 
+    async def search_candidates(self, query: str, document_id: str, limit: int = 15, query_embedding=None) -> List[dict]:
+        """Like search(), but returns each chunk's text with its stored vector for re-ranking."""
+        try:
+            results = await self._query(query, document_id, limit, query_embedding, include_values=True)
+            
+            candidates = [
+                {"text": match.metadata["text"], "values": match.values, "score": match.score}
+                for match in results.matches if "text" in match.metadata
+            ]
+            logger.info(" Search found %d candidate chunks for document %s", len(candidates), document_id)
+            return candidates
+        except Exception as e:
+            logger.error(f" Candidate search failed: {e}")
+            return []
+
     def add_to_pinecone_fallback(self, chunks: List[str], document_id: str):
         """Add chunks to Pinecone with document_id in metadata."""
         try:
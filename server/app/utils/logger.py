@@ -1,18 +1,115 @@
-from typing import List
+from typing import List, Optional
+import os
+import queue
+import random
 import logging
+import contextvars
+from logging.handlers import QueueHandler, QueueListener
 
 logger = logging.getLogger("hackrx")
 
+# Correlation id of the request being handled, set by the request middleware
+request_id_var = contextvars.ContextVar("request_id", default="-")
+# Whether this request logs verbose content; decided once so a sampled request
+# logs its prompt, response and answers together
+content_sampled_var = contextvars.ContextVar("content_sampled", default=None)
+
+MAX_FIELD_CHARS = int(os.getenv("LOG_MAX_FIELD_CHARS", "300"))
+CONTENT_SAMPLE_RATE = float(os.getenv("LOG_CONTENT_SAMPLE_RATE", "0.1"))
+
+_listener: Optional[QueueListener] = None
+
+
+class Truncated:
+    """Log argument that caps a payload's size, formatted only if the record is emitted."""
+    __slots__ = ("text", "limit")
+
+    def __init__(self, text: str, limit: int = MAX_FIELD_CHARS):
+        self.text = text
+        self.limit = limit
+
+    def __str__(self):
+        if len(self.text) <= self.limit:
+            return self.text
+        return f"{self.text[:self.limit]}... ({len(self.text)} chars)"
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamps each record with the current request's correlation id."""
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread."""
+
+    def prepare(self, record):
+        return record
+
+
+def setup_logging(level: int = logging.INFO):
+    """Routes the app logger through a queue so handlers run on a background thread."""
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(
+        "%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"
+    ))
+
+    queue_handler = _DeferredQueueHandler(queue.SimpleQueue())
+    queue_handler.addFilter(RequestIdFilter())
+
+    logger.handlers = [queue_handler]
+    logger.setLevel(level)
+    logger.propagate = False
+
+    _listener = QueueListener(queue_handler.queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging():
+    """Flushes queued records and stops the background listener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def sample_content_logs() -> bool:
+    """Makes the per-request sampling decision for verbose content logs."""
+    return random.random() < CONTENT_SAMPLE_RATE
+
+
+def content_log_enabled() -> bool:
+    """
+    Sampling gate for verbose content logs (prompts, responses, chunk texts).
+    Uses the current request's decision; outside a request, samples per call.
+    """
+    if not logger.isEnabledFor(logging.INFO):
+        return False
+    sampled = content_sampled_var.get()
+    return sample_content_logs() if sampled is None else sampled
+
+
 def log_document_content(content: str, max_chars: int = 1000):
-    logger.info(f"📄 Document content preview ({len(content)} chars):")
-    logger.info(content[:max_chars])
+    if not content_log_enabled():
+        return
+    logger.info("📄 Document content preview (%d chars): %s", len(content), Truncated(content, max_chars))
 
 def log_chunks_preview(chunks: List[str], max_chunks: int = 3):
-    logger.info(f"📦 Created {len(chunks)} chunks. Preview:")
+    logger.info("📦 Created %d chunks.", len(chunks))
+    if not content_log_enabled():
+        return
     for i, chunk in enumerate(chunks[:max_chunks]):
-        logger.info(f"Chunk {i+1}: {chunk[:200]}...")
+        logger.info("Chunk %d: %s", i + 1, Truncated(chunk, 200))
 
 def log_search_results(question: str, chunks: List[str], max_results: int = 2):
-    logger.info(f"🔍 Search results for '{question[:50]}...': {len(chunks)} chunks found")
+    logger.info("🔍 Search results for '%s': %d chunks found", Truncated(question, 50), len(chunks))
+    if not content_log_enabled():
+        return
     for i, chunk in enumerate(chunks[:max_results]):
-        logger.info(f"Result {i+1}: {chunk[:150]}...")
+        logger.info("Result %d: %s", i + 1, Truncated(chunk, 150))
@@ -1,55 +1,44 @@
 # main.py
 
 import uvicorn
-from fastapi import FastAPI
+import uuid
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import os
 from dotenv import load_dotenv  # <- load .env file
 
-# --- ADD THESE IMPORTS FOR YOUR SERVICES ---
-from app.services.content_processor import ContentProcessor
-from app.services.chunker import ImprovedTextChunker
-from app.services.llm_processor import ImprovedLLMProcessor
-from app.services.vector_store import EnhancedHybridVectorStore
+# Services are built lazily by the registry; heavy SDKs are only imported there
+from app.services.registry import ServiceRegistry
 
 from app.routes import endpoints
-from app.utils.logger import logger  # Corrected logger import
-from app.services.embedding_model import OpenAIEmbeddingModel
-import pinecone
-import google.generativeai as genai
+from app.utils.logger import (  # Corrected logger import
+    logger, setup_logging, shutdown_logging, request_id_var, content_sampled_var, sample_content_logs
+)
 
 # Load environment variables from .env
 load_dotenv()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    setup_logging()
     logger.info("Application startup...")
     
-    # Load models and clients and attach them to the app's state
-    logger.info("Loading embedding model...")
-    app.state.embedding_model = OpenAIEmbeddingModel()
-
-    logger.info("Initializing Pinecone...")
-    pc = pinecone.Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
-    index_name = os.getenv("PINECONE_INDEX")
-    app.state.pinecone_index = pc.Index(index_name)
+    # Services are constructed on first use; see app/services/registry.py
+    app.state.services = ServiceRegistry()
 
-    logger.info("Initializing Gemini...")
-    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-
-    # Initialize other services
-    app.state.content_processor = ContentProcessor()
-    app.state.text_chunker = ImprovedTextChunker()
-    app.state.llm_processor = ImprovedLLMProcessor()
-    app.state.vector_store = EnhancedHybridVectorStore(
-        embedding_model=app.state.embedding_model,
-        pinecone_index=app.state.pinecone_index
-    )
+    # Optionally build and prime everything in the background so /ready flips
+    # once dependencies are usable, without delaying startup. Otherwise the
+    # first /ready call starts it.
+    if os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true":
+        app.state.services.start_warm_up()
 
     yield
     
     logger.info("Application shutdown...")
+    if "precomputer" in app.state.services.built_services():
+        await (await app.state.services.get("precomputer")).stop()
+    shutdown_logging()
 
 app = FastAPI(title="RAG API", lifespan=lifespan)
 
@@ -75,6 +64,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def assign_request_id(request: Request, call_next):
+    # Correlation id for every log line emitted while handling this request
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex[:12]
+    token = request_id_var.set(request_id)
+    sampled_token = content_sampled_var.set(sample_content_logs())
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_var.reset(token)
+        content_sampled_var.reset(sampled_token)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
 app.include_router(endpoints.router)
 
 if __name__ == "__main__":
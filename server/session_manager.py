@@ -9,11 +9,12 @@ def get_session_data(session_id: str) -> Optional[Dict[str, Any]]:
     """Retrieves the data for a given session ID."""
     return SESSION_STORAGE.get(session_id)
 
-def update_session_data(session_id: str, document_id: str, full_text: str):
+def update_session_data(session_id: str, document_id: str, full_text: str, content_hash: str):
     """Stores or updates the data for a given session ID."""
     SESSION_STORAGE[session_id] = {
         "document_id": document_id,
-        "full_text": full_text
+        "full_text": full_text,
+        "content_hash": content_hash
     }
 
 def get_or_create_session_id(session_cookie: Optional[str]) -> str: